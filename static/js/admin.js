@@ -0,0 +1,331 @@
+// Entries load a bounded page at a time within the From/To window (default: from 90 days ago, no end)
+const ADMIN_PAGE = 200;
+const DEFAULT_WINDOW_DAYS = 90;
+let optsFrag = document.createDocumentFragment();  // project <option>s for row selects
+let lastEntry = null;
+
+function entriesUrl(more) {
+  const start = document.getElementById('adminStart').value;
+  const end = document.getElementById('adminEnd').value;
+  let url = `/api/entries?limit=${ADMIN_PAGE}`;
+  if (start) url += `&start=${start}`;
+  if (end) url += `&end=${end}`;
+  if (more && lastEntry) {
+    url += `&before=${encodeURIComponent(lastEntry.start_time)}&before_id=${lastEntry.id}`;
+  }
+  return url;
+}
+
+// A full loadAll aborts whatever load is still in flight so only the latest one renders.
+// "more" pages wait for a full load in flight (`reloading`), so the cursor comes from its first
+// page, then share the current controller so the next reload cancels them too.
+let loadAC = null;
+let reloading = null;  // settles (never rejects) when the full load in flight is done
+
+async function loadAll(more=false) {
+  if (more) {
+    while (reloading) await reloading;
+  } else if (loadAC) {
+    loadAC.abort();
+  }
+  if (!more || !loadAC) loadAC = new AbortController();
+  const {signal} = loadAC;
+  let done = null, mine = null;
+  if (!more) reloading = mine = new Promise(resolve => { done = resolve; });
+  try {
+    if (more) {
+      const entries = await jsonFetch(entriesUrl(true), {signal});
+      if (!signal.aborted) renderEntryRows(entries, true);
+      return;
+    }
+    // The projects GET is a shared cached promise, so it is left un-aborted and just ignored below
+    const [projects, entries] = await Promise.all([
+      jsonFetch('/api/projects', {memo: true}),
+      jsonFetch(entriesUrl(false), {signal})
+    ]);
+    if (signal.aborted) return;
+    renderAll(projects, entries);
+  } catch (err) {
+    if (err.name !== 'AbortError') throw err;
+  } finally {
+    if (done) { if (reloading === mine) reloading = null; done(); }
+  }
+}
+
+function renderAll(projects, entries) {
+  // Project log covers all projects (including inactive ones); rows are rendered lazily
+  projectLog = projects.map(p => {
+    const cells = [p.id, p.prefix, p.title, p.division, p.is_active ? 'Yes' : 'No'];
+    // Lowercased row text, built once per load from the same cells the row shows
+    const search = cells.join(' ').toLowerCase();
+    return {p, cells, search, bloom: trigramBloom(search)};
+  });
+  logByActive = {
+    '': projectLog,
+    'true': projectLog.filter(r => r.p.is_active),
+    'false': projectLog.filter(r => !r.p.is_active),
+  };
+  filterCache.clear();
+  lastFilter = null;
+  applyProjectFilters();
+  // Project <option>s built once as DOM nodes; each row's select gets a clone
+  optsFrag = document.createDocumentFragment();
+  for (const p of projects) {
+    const o = document.createElement('option');
+    o.value = p.id;
+    o.textContent = `${p.prefix} — ${p.title}`;
+    optsFrag.appendChild(o);
+  }
+  renderEntryRows(entries, false);
+}
+
+function renderEntryRows(entries, append) {
+  const tbody = document.querySelector('#adminTable tbody');
+  const frag = document.createDocumentFragment();
+  const rowTpl = document.getElementById('adminRowTpl');
+  for (const e of entries) {
+    // Unshift to raw for admin editing
+    const sStored = new Date(e.start_time);
+    const enStored = new Date(e.end_time);
+    const sRaw = new Date(sStored.getTime() + (e.travel_morning ? 60*60*1000 : 0));
+    const enRaw = new Date(enStored.getTime() - (e.travel_afternoon ? 60*60*1000 : 0));
+
+    // Clone the pre-parsed row and fill it through DOM properties
+    const tr = rowTpl.content.firstElementChild.cloneNode(true);
+    tr.querySelector("[data-cell='id']").textContent = e.id;
+    tr.querySelector("[data-cell='user']").textContent = e.creator_username || '';
+    tr.querySelector("[data-cell='hours']").textContent = e.duration_hours.toFixed(2);
+    tr.querySelectorAll('[data-field]').forEach(el => { el.dataset.id = e.id; });
+    tr.querySelector('[data-del]').dataset.del = e.id;
+    const sel = tr.querySelector("[data-field='project_id']");
+    sel.appendChild(optsFrag.cloneNode(true));
+    sel.value = e.project_id;
+    tr.querySelector("[data-field='notes']").value = e.notes || '';
+    tr.querySelector("[data-field='date']").value = toLocalDate(sRaw);
+    tr.querySelector("[data-field='start_only']").value = toLocalTime(sRaw);
+    tr.querySelector("[data-field='end_only']").value = toLocalTime(enRaw);
+    tr.querySelector("[data-field='travel_morning']").checked = !!e.travel_morning;
+    tr.querySelector("[data-field='travel_afternoon']").checked = !!e.travel_afternoon;
+    frag.appendChild(tr);
+  }
+  if (append) tbody.appendChild(frag); else tbody.replaceChildren(frag);
+  if (entries.length) lastEntry = entries[entries.length - 1];
+  document.getElementById('adminLoadMore').classList.toggle('hidden', entries.length < ADMIN_PAGE);
+}
+
+function gatherRowBody(row){
+  const date = row.querySelector("[data-field='date']").value;
+  const st = row.querySelector("[data-field='start_only']").value;
+  const en = row.querySelector("[data-field='end_only']").value;
+  return {
+    project_id: Number(row.querySelector("[data-field='project_id']").value),
+    start_time: `${date}T${st}`,
+    end_time: `${date}T${en}`,
+    notes: row.querySelector("[data-field='notes']").value,
+    travel_morning: row.querySelector("[data-field='travel_morning']").checked,
+    travel_afternoon: row.querySelector("[data-field='travel_afternoon']").checked,
+  };
+}
+
+// Pending row edits, keyed by entry id. Edits landing within 400ms of each other
+// (on any rows) are flushed together as one bulk PUT.
+const pending = new Map();
+let flushTimer = null;
+let inflight = null;  // Map id -> body for the bulk PUT on the wire; batches go out one at a time
+let inflightDone = null;  // settles when that PUT has (resolves either way)
+
+async function flushPending() {
+  flushTimer = null;
+  // Never overlap batches: aborting a sent PUT doesn't stop the server, which could commit it
+  // after a newer batch and store an older snapshot. So a batch that is ready while one is on
+  // the wire stays in `pending` and is sent when that PUT settles (see finally). Edits not yet
+  // sent are the only ones superseded, by resetting the debounce timer.
+  if (inflight || !pending.size) return;
+  inflight = new Map(pending);
+  pending.clear();
+  let settle;
+  inflightDone = new Promise(resolve => { settle = resolve; });
+  const updates = Array.from(inflight, ([id, body]) => ({id: Number(id), ...body}));
+  try {
+    // keepalive lets the browser finish the save even if the page is closed mid-request
+    const saved = await jsonFetch('/api/entries/bulk', {method: 'PUT', body: JSON.stringify(updates), keepalive: true});
+    // The inputs already hold what was sent; only the derived hours cell needs the server's value
+    const tbody = document.querySelector('#adminTable tbody');
+    for (const e of saved) {
+      const btn = tbody.querySelector(`[data-del="${e.id}"]`);
+      if (btn) btn.closest('tr').querySelector("[data-cell='hours']").textContent = e.duration_hours.toFixed(2);
+    }
+  } catch (err) {
+    alert(err.message);
+    const badId = err.body && err.body.id != null ? String(err.body.id) : null;
+    if (badId !== null && inflight.has(badId)) {
+      // The batch rolled back because of one row: drop just that edit (its inputs stay for the
+      // user to correct, as with a per-row save) and re-queue the rest unless a newer edit is pending
+      for (const [id, body] of inflight) if (id !== badId && !pending.has(id)) pending.set(id, body);
+    } else {
+      pending.clear();  // the reload below re-renders every row from the stored values
+      await loadAll();  // no row to blame; put the rows back to the stored values
+    }
+  } finally {
+    inflight = null;
+    settle();
+    if (pending.size && !flushTimer) flushPending();
+  }
+}
+
+// One delegated change listener for every editable cell (registered once, survives re-renders)
+document.querySelector('#adminTable tbody').addEventListener('change', (ev) => {
+  const id = ev.target.dataset.id;
+  if (!id) return;
+  const row = ev.target.closest('tr');
+  const body = gatherRowBody(row);
+  pending.set(id, body);
+  // Optimistic hours (travel adds an hour each side); the saved value replaces it on success
+  const hours = (new Date(body.end_time) - new Date(body.start_time)) / 3600000
+    + body.travel_morning + body.travel_afternoon;
+  if (hours > 0) row.querySelector("[data-cell='hours']").textContent = hours.toFixed(2);
+  clearTimeout(flushTimer);
+  flushTimer = setTimeout(flushPending, 400);
+});
+
+// Don't hold edits in the debounce window when the tab is hidden or being closed
+document.addEventListener('visibilitychange', () => {
+  if (document.visibilityState === 'hidden' && flushTimer) { clearTimeout(flushTimer); flushPending(); }
+});
+
+// ...and one delegated click listener for the Delete buttons
+document.querySelector('#adminTable tbody').addEventListener('click', async (ev) => {
+  const btn = ev.target.closest('[data-del]');
+  if (!btn || !(await askConfirm('Delete this entry?'))) return;
+  const id = btn.dataset.del;
+  try {
+    // A bulk PUT already carrying this row must land first; deleting under it would 404 and
+    // roll back the whole batch. Unsent edits for the row are simply dropped.
+    pending.delete(id);
+    if (inflight && inflight.has(id)) await inflightDone;
+    await jsonFetch(`/api/entries/${id}`, {method: 'DELETE'});
+    pending.delete(id);  // in case the row was edited while we waited
+    // A failed batch reloads the table while we wait, so find the row again in the live tbody
+    const live = document.querySelector(`#adminTable tbody [data-del="${id}"]`);
+    if (live) live.closest('tr').remove();
+  } catch (err) { alert(err.message); }
+});
+
+// Project log: projects are filtered as a plain array and only the first PROJECT_LOG_CHUNK
+// matches become <tr>s; the next chunk is appended as the sentinel under the table nears view.
+// Without IntersectionObserver nothing would fetch later chunks, so render everything at once.
+const PROJECT_LOG_CHUNK = 'IntersectionObserver' in window ? 100 : Infinity;
+let projectLog = [];   // [{p, cells, search}] from the last loadAll
+let logByActive = {'': []};  // projectLog pre-split by the active filter's values: '', 'true', 'false'
+let logMatches = [];   // projectLog entries passing the current filters
+let logShown = 0;      // how many of logMatches are in the DOM
+
+// 256-bit Bloom filter over a string's 3-grams (FNV-1a, two bits per gram by double hashing).
+// A row can only contain the query if its filter has every bit of the query's filter set,
+// so most non-matching rows are rejected by eight integer ANDs before any substring scan.
+function trigramBloom(text) {
+  const bits = new Uint32Array(8);
+  for (let i = 0; i + 3 <= text.length; i++) {
+    let h = 2166136261;
+    for (let j = i; j < i + 3; j++) h = Math.imul(h ^ text.charCodeAt(j), 16777619);
+    const h1 = h & 255, h2 = ((h >>> 8) & 255) | 1;
+    for (const b of [h1, (h1 + h2) & 255]) bits[b >>> 5] |= 1 << (b & 31);
+  }
+  return bits;
+}
+function bloomCovers(rowBits, queryBits) {
+  for (let i = 0; i < 8; i++) if ((rowBits[i] & queryBits[i]) !== queryBits[i]) return false;
+  return true;
+}
+
+// Recent filter results keyed by `${active}||${search}` (FIFO, cleared when projectLog reloads),
+// plus the last run so a longer search can narrow the previous matches instead of every project
+const FILTER_CACHE_MAX = 32;
+const filterCache = new Map();
+let lastFilter = null;  // {active, search, matches}
+
+function showMoreProjectLog() {
+  const frag = document.createDocumentFragment();
+  for (const {cells} of logMatches.slice(logShown, logShown + PROJECT_LOG_CHUNK)) {
+    const tr = document.createElement('tr');
+    tr.className = 'border-b';
+    for (const v of cells) {
+      const td = document.createElement('td');
+      td.textContent = v;
+      tr.appendChild(td);
+    }
+    tr.firstChild.className = 'py-2';
+    frag.appendChild(tr);
+  }
+  logShown = Math.min(logShown + PROJECT_LOG_CHUNK, logMatches.length);
+  document.querySelector('#projectLogTable tbody').appendChild(frag);
+}
+
+// Filter functions for the project log table
+function applyProjectFilters() {
+  const searchEl = document.getElementById('projectSearch');
+  const activeEl = document.getElementById('projectActiveFilter');
+  const search = searchEl ? searchEl.value.trim().toLowerCase() : '';
+  const active = activeEl ? activeEl.value : '';
+  const key = `${active}||${search}`;
+  let matches = filterCache.get(key);
+  if (!matches) {
+    // Anything matching "abc" also matches "ab", so extending the last search only rescans its hits
+    const narrowing = lastFilter && lastFilter.active === active && search.startsWith(lastFilter.search);
+    const base = narrowing ? lastFilter.matches : (logByActive[active] || projectLog);
+    if (search.length >= 3) {
+      const q = trigramBloom(search);
+      matches = base.filter(r => bloomCovers(r.bloom, q) && r.search.includes(search));
+    } else {
+      matches = search ? base.filter(r => r.search.includes(search)) : base;
+    }
+    if (filterCache.size >= FILTER_CACHE_MAX) filterCache.delete(filterCache.keys().next().value);
+    filterCache.set(key, matches);
+  }
+  lastFilter = {active, search, matches};
+  logMatches = matches;
+  document.querySelector('#projectLogTable tbody').replaceChildren();
+  logShown = 0;
+  showMoreProjectLog();
+  rearmProjectLog();  // the sentinel may never have left view, so no new intersection would fire
+}
+
+const logSentinel = document.getElementById('projectLogMore');
+let logIO = null;
+function rearmProjectLog() {
+  if (logIO) { logIO.unobserve(logSentinel); logIO.observe(logSentinel); }
+}
+if ('IntersectionObserver' in window) {
+  logIO = new IntersectionObserver(es => {
+    if (!es.some(e => e.isIntersecting) || logShown >= logMatches.length) return;
+    showMoreProjectLog();
+    rearmProjectLog();  // re-check in case it is still in view
+  }, {rootMargin: '300px'});
+  logIO.observe(logSentinel);
+}
+
+// Attach filter event listeners
+(function() {
+  const searchEl = document.getElementById('projectSearch');
+  if (searchEl) {
+    // Typing bursts collapse into one filter pass (debounce comes from common.js)
+    searchEl.addEventListener('input', debounce(applyProjectFilters, 250));
+  }
+  const activeEl = document.getElementById('projectActiveFilter');
+  if (activeEl) {
+    activeEl.addEventListener('change', applyProjectFilters);
+  }
+})();
+
+// Date window and paging controls
+(function() {
+  const today = new Date();
+  const from = new Date(today); from.setDate(today.getDate() - DEFAULT_WINDOW_DAYS);
+  document.getElementById('adminStart').value = toLocalDate(from);
+  const reload = () => loadAll().catch(err => alert(err.message));
+  document.getElementById('adminStart').addEventListener('change', reload);
+  document.getElementById('adminEnd').addEventListener('change', reload);
+  autoLoadMore(document.getElementById('adminLoadMore'), () => loadAll(true));
+})();
+
+loadAll();
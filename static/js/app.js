@@ -0,0 +1,252 @@
+function combineISO(dateStr, timeStr) {
+  return `${dateStr}T${timeStr}`; // YYYY-MM-DDTHH:MM
+}
+
+// Populate project select only (no management here)
+// Store all projects for dynamic filtering in Add Time page (filled by /api/bootstrap)
+let projectData = [];
+
+// Render the project select options based on MP/LP checkbox filters
+function renderProjectSelect() {
+  const select = document.getElementById('entryProject');
+  if (!select) return;
+  select.innerHTML = '';
+  const mpCheckbox = document.getElementById('filterMP');
+  const lpCheckbox = document.getElementById('filterLP');
+  const showMP = mpCheckbox ? mpCheckbox.checked : false;
+  const showLP = lpCheckbox ? lpCheckbox.checked : false;
+  const showMPActual = showMP || (!showMP && !showLP);
+  const showLPActual = showLP || (!showMP && !showLP);
+
+  const mpGroup = document.createElement('optgroup');
+  mpGroup.label = 'Melbourne Power';
+  const lpGroup = document.createElement('optgroup');
+  lpGroup.label = 'Liquid Pack';
+
+  for (const p of projectData) {
+    if (!p.is_active) continue;
+    if (p.division === 'Melbourne Power' && !showMPActual) continue;
+    if (p.division === 'Liquid Pack' && !showLPActual) continue;
+    const opt = document.createElement('option');
+    opt.value = p.id;
+    // Add a '#' to the prefix for Liquid Pack machine ID projects (prefix outside 2000-2999)
+    let displayPrefix = p.prefix;
+    if (p.division === 'Liquid Pack') {
+      if (p.prefix < 2000 || p.prefix >= 3000) {
+        displayPrefix = `#${p.prefix}`;
+      }
+    }
+    opt.textContent = `${displayPrefix} — ${p.title}`;
+    (p.division === 'Melbourne Power' ? mpGroup : lpGroup).appendChild(opt);
+  }
+  if (mpGroup.children.length) select.appendChild(mpGroup);
+  if (lpGroup.children.length) select.appendChild(lpGroup);
+}
+
+function setDefaultDateAndTimes() {
+  const today = new Date();
+  document.getElementById('entryDate').value = toLocalDate(today);
+  document.getElementById('entryStartTime').value = '06:00';
+  // Default end time changed from 16:00 to 14:30 per new requirements
+  document.getElementById('entryEndTime').value = '14:30';
+  document.getElementById('travelMorning').checked = false;
+  document.getElementById('travelAfternoon').checked = false;
+}
+
+// Recent Entries are fetched a page at a time, newest first
+const ENTRIES_PAGE = 50;
+let lastEntry = null;
+const entriesById = new Map();  // rendered rows' entries, for the delegated Edit handler
+
+// A fresh (non-"more") load aborts any load still in flight, so a stale list never renders.
+// A "more" load waits for a fresh one in flight (`reloading`), so its cursor comes from the new
+// first page, then shares that controller so the next fresh load cancels it too.
+let loadAC = null;
+let reloading = null;  // settles (never rejects) when the fresh load in flight is done
+
+async function loadEntries(more=false) {
+  if (more) {
+    while (reloading) await reloading;
+  } else if (loadAC) {
+    loadAC.abort();
+  }
+  if (!more || !loadAC) loadAC = new AbortController();
+  let url = `/api/entries?limit=${ENTRIES_PAGE}`;
+  if (more && lastEntry) {
+    url += `&before=${encodeURIComponent(lastEntry.start_time)}&before_id=${lastEntry.id}`;
+  }
+  const {signal} = loadAC;
+  let done = null, mine = null;
+  if (!more) reloading = mine = new Promise(resolve => { done = resolve; });
+  try {
+    const data = await jsonFetch(url, {signal});
+    if (!signal.aborted) renderEntries(data, more);
+  } catch (err) {
+    if (err.name !== 'AbortError') throw err;
+  } finally {
+    if (done) { if (reloading === mine) reloading = null; done(); }
+  }
+}
+
+function renderEntries(data, append) {
+  const tbody = document.querySelector('#entriesTable tbody');
+  const frag = document.createDocumentFragment();
+  if (!append) entriesById.clear();
+  if (data.length) lastEntry = data[data.length - 1];
+  document.getElementById('loadMoreEntries').classList.toggle('hidden', data.length < ENTRIES_PAGE);
+  const rowTpl = document.getElementById('entryRowTpl');
+  for (const e of data) {
+    const tr = rowTpl.content.firstElementChild.cloneNode(true);
+    fillEntryRow(tr, e);
+    frag.appendChild(tr);
+  }
+  if (append) tbody.appendChild(frag); else tbody.replaceChildren(frag);
+}
+
+// Write one entry into a (cloned or already rendered) Recent Entries row
+function fillEntryRow(tr, e) {
+  const s = new Date(e.start_time);
+  const ed = new Date(e.end_time);
+  tr.querySelector("[data-cell='project']").textContent = `${e.project_prefix} — ${e.project_title}`;
+  tr.querySelector("[data-cell='user']").textContent = e.creator_username || '';
+  tr.querySelector("[data-cell='date']").textContent = toLocalDate(s);
+  tr.querySelector("[data-cell='start']").textContent = toLocalTime(s);
+  tr.querySelector("[data-cell='end']").textContent = toLocalTime(ed);
+  tr.querySelector("[data-cell='hours']").textContent = e.duration_hours.toFixed(2);
+  tr.querySelector("[data-cell='notes']").textContent = e.notes || '';
+  tr.querySelector('[data-edit]').dataset.edit = e.id;
+  tr.querySelector('[data-del]').dataset.del = e.id;
+  entriesById.set(e.id, e);
+}
+
+document.getElementById('entryForm').addEventListener('submit', (e) => e.preventDefault());
+
+document.getElementById('addEntryBtn').addEventListener('click', async (e) => {
+  e.preventDefault();
+  try {
+    const project_id = document.getElementById('entryProject').value;
+    const notes = document.getElementById('entryNotes').value;
+    const dateStr = document.getElementById('entryDate').value;     // YYYY-MM-DD
+    const start_t = document.getElementById('entryStartTime').value; // HH:MM
+    const end_t = document.getElementById('entryEndTime').value;     // HH:MM
+    const travel_morning = document.getElementById('travelMorning').checked;
+    const travel_afternoon = document.getElementById('travelAfternoon').checked;
+
+    const start_time = combineISO(dateStr, start_t); // raw
+    const end_time = combineISO(dateStr, end_t);     // raw
+
+    await jsonFetch('/api/entries', {
+      method: 'POST',
+      body: JSON.stringify({
+        project_id, notes,
+        start_time, end_time,   // raw from user inputs
+        travel_morning, travel_afternoon
+      })
+    });
+    document.getElementById('entryNotes').value = '';
+    setDefaultDateAndTimes();
+    await loadEntries();
+  } catch (err) { alert(err.message); }
+});
+
+// One delegated click listener for every row's Edit/Delete buttons (survives re-renders)
+document.querySelector('#entriesTable tbody').addEventListener('click', async (ev) => {
+  const editBtn = ev.target.closest('[data-edit]');
+  if (editBtn) return openEditModal(entriesById.get(Number(editBtn.dataset.edit)));
+  const delBtn = ev.target.closest('[data-del]');
+  if (!delBtn || !(await askConfirm('Delete this entry?'))) return;
+  try {
+    await jsonFetch(`/api/entries/${delBtn.dataset.del}`, {method: 'DELETE'});
+    entriesById.delete(Number(delBtn.dataset.del));
+    delBtn.closest('tr').remove();
+  } catch (err) { alert(err.message); }
+});
+
+autoLoadMore(document.getElementById('loadMoreEntries'), () => loadEntries(true));
+
+document.getElementById('exportCsv').addEventListener('click', (e) => {
+  e.preventDefault();
+  window.location = '/api/export';
+});
+
+// Edit modal (uses date picker & time-only inputs)
+function openEditModal(entry) {
+  // Start the (usually cached) project fetch before building the overlay so it overlaps the DOM work
+  const projectsP = jsonFetch('/api/projects', {memo: true});
+  const overlay = document.createElement('div');
+  overlay.className = 'fixed inset-0 bg-black/40 flex items-center justify-center p-4';
+  overlay.appendChild(document.getElementById('editEntryTpl').content.cloneNode(true));
+  overlay.querySelector('.entryId').textContent = entry.id;
+  overlay.querySelector('.entryCreator').textContent = entry.creator_username || '—';
+
+  overlay.querySelector('#editNotes').value = entry.notes || '';
+
+  // Display raw times (unshifted) derived from stored values
+  const sStored = new Date(entry.start_time);
+  const eStored = new Date(entry.end_time);
+  const sRaw = new Date(sStored.getTime() + (entry.travel_morning ? 60*60*1000 : 0));
+  const eRaw = new Date(eStored.getTime() - (entry.travel_afternoon ? 60*60*1000 : 0));
+  overlay.querySelector('#editDate').value = toLocalDate(sRaw);
+  overlay.querySelector('#editStartTime').value = toLocalTime(sRaw);
+  overlay.querySelector('#editEndTime').value = toLocalTime(eRaw);
+
+  overlay.querySelector('#editTravelMorning').checked = !!entry.travel_morning;
+  overlay.querySelector('#editTravelAfternoon').checked = !!entry.travel_afternoon;
+
+  document.body.appendChild(overlay);
+
+  (async () => {
+    const projects = await projectsP;
+    const sel = overlay.querySelector('#editProject');
+    const mpGroup = document.createElement('optgroup'); mpGroup.label = 'Melbourne Power';
+    const lpGroup = document.createElement('optgroup'); lpGroup.label = 'Liquid Pack';
+    for (const p of projects) {
+      if (!p.is_active && p.id !== entry.project_id) continue;
+      const opt = document.createElement('option');
+      opt.value = p.id; opt.textContent = `${p.prefix} — ${p.title}`;
+      if (p.id === entry.project_id) opt.selected = true;
+      (p.division === 'Melbourne Power' ? mpGroup : lpGroup).appendChild(opt);
+    }
+    sel.appendChild(mpGroup); sel.appendChild(lpGroup);
+  })();
+
+  overlay.querySelector('#cancelModal').onclick = () => overlay.remove();
+  overlay.querySelector('#saveModal').onclick = async () => {
+    try {
+      const dateStr = overlay.querySelector('#editDate').value;
+      const st = overlay.querySelector('#editStartTime').value;
+      const en = overlay.querySelector('#editEndTime').value;
+      const body = {
+        project_id: Number(overlay.querySelector('#editProject').value),
+        notes: overlay.querySelector('#editNotes').value,
+        start_time: `${dateStr}T${st}`,  // raw
+        end_time: `${dateStr}T${en}`,    // raw
+        travel_morning: overlay.querySelector('#editTravelMorning').checked,
+        travel_afternoon: overlay.querySelector('#editTravelAfternoon').checked,
+      };
+      const updated = await jsonFetch(`/api/entries/${entry.id}`, {method: 'PUT', body: JSON.stringify(body)});
+      overlay.remove();
+      // Same start keeps the row's place in the start-time ordering, so patch it; otherwise re-list
+      const row = document.querySelector(`#entriesTable [data-edit="${entry.id}"]`);
+      if (row && updated.start_time === entry.start_time) fillEntryRow(row.closest('tr'), updated);
+      else await loadEntries();
+    } catch (err) { alert(err.message); }
+  };
+}
+
+// Init
+(function init(){
+  // inject nav HTML from server
+  // attach filter change events for project select in Add Time page
+  const mpChk = document.getElementById('filterMP');
+  if (mpChk) mpChk.addEventListener('change', renderProjectSelect);
+  const lpChk = document.getElementById('filterLP');
+  if (lpChk) lpChk.addEventListener('change', renderProjectSelect);
+})();
+// Projects and the first page of entries arrive in a single round-trip
+jsonFetch(`/api/bootstrap?limit=${ENTRIES_PAGE}`).then((boot) => {
+  projectData = boot.projects;
+  renderProjectSelect();
+  setDefaultDateAndTimes();
+  renderEntries(boot.entries, false);
+});
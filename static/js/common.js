@@ -0,0 +1,101 @@
+// Helpers shared by every page. Loaded as a classic script ahead of each page's
+// own script (static/js/<page>.js), so these are plain globals.
+
+// Short-lived in-memory cache for idempotent GETs: url -> {t, p} (p = pending/resolved promise)
+const _cache = new Map();
+function invalidate(prefix) {
+  for (const url of _cache.keys()) if (url.startsWith(prefix)) _cache.delete(url);
+}
+
+async function _fetchJSON(url, opts) {
+  const res = await fetch(url, Object.assign({headers: {'Content-Type': 'application/json'}}, opts));
+  if (!res.ok) {
+    let msg = res.statusText, body = null;
+    try { body = await res.json(); msg = body.error || JSON.stringify(body) } catch {}
+    const err = new Error(msg);
+    err.body = body;  // e.g. the bulk PUT names the rejected row as body.id
+    throw err;
+  }
+  if (res.status === 204) return null;  // e.g. DELETE
+  return res.json();
+}
+
+// opts.memo: reuse a response younger than opts.ttl ms (default 60s). Other options, including
+// the standard `cache` mode, go to fetch unchanged.
+// Any non-GET drops cached GETs for the same collection, e.g. /api/projects*.
+function jsonFetch(url, opts={}) {
+  const {memo = false, ttl = 60000, ...fetchOpts} = opts;
+  if (fetchOpts.method && fetchOpts.method !== 'GET') invalidate(url.split('/').slice(0, 3).join('/'));
+  if (!memo) return _fetchJSON(url, fetchOpts);
+  const hit = _cache.get(url);
+  if (hit && Date.now() - hit.t < ttl) return hit.p;
+  const p = _fetchJSON(url, fetchOpts);
+  _cache.set(url, {t: Date.now(), p});
+  p.catch(() => _cache.delete(url));
+  return p;
+}
+
+// Trailing-edge debounce so a burst of events runs the handler once
+function debounce(fn, ms) {
+  let t;
+  return (...args) => { clearTimeout(t); t = setTimeout(() => fn(...args), ms); };
+}
+
+// Wire a "Load more" button to `load` and also trigger it whenever the button scrolls
+// near the viewport, so keyset-paged lists fill in as the user scrolls. The button stays
+// as the fallback; `busy` keeps the click and the observer from fetching the same page twice.
+function autoLoadMore(btn, load) {
+  let busy = false;
+  let io = null;
+  const run = async () => {
+    if (busy || btn.classList.contains('hidden')) return;
+    busy = true;
+    try { await load(); } catch (err) { alert(err.message); }
+    finally {
+      busy = false;
+      // Re-observe so a button still in view after a short page triggers the next one
+      if (io) { io.unobserve(btn); io.observe(btn); }
+    }
+  };
+  btn.addEventListener('click', run);
+  if ('IntersectionObserver' in window) {
+    io = new IntersectionObserver(es => { if (es.some(e => e.isIntersecting)) run(); }, {rootMargin: '200px'});
+    io.observe(btn);
+  }
+}
+
+// Non-blocking replacement for confirm(): resolves true when OK is pressed. The <dialog>
+// is created on first use and reused; Escape or Cancel resolve false.
+let _confirmDlg = null;
+function askConfirm(msg) {
+  if (!_confirmDlg) {
+    _confirmDlg = document.createElement('dialog');
+    _confirmDlg.className = 'rounded-2xl shadow-xl p-4 max-w-sm backdrop:bg-black/40';
+    _confirmDlg.innerHTML = `
+      <form method="dialog">
+        <p class="msg mb-4"></p>
+        <div class="flex justify-end gap-2">
+          <button value="cancel" class="px-3 py-1 border rounded">Cancel</button>
+          <button value="ok" class="px-3 py-1 rounded bg-black text-white">OK</button>
+        </div>
+      </form>`;
+    document.body.appendChild(_confirmDlg);
+  }
+  const dlg = _confirmDlg;
+  dlg.querySelector('.msg').textContent = msg;
+  dlg.returnValue = '';
+  return new Promise(resolve => {
+    dlg.addEventListener('close', () => resolve(dlg.returnValue === 'ok'), {once: true});
+    dlg.showModal();
+  });
+}
+
+const pad = (n) => String(n).padStart(2, '0');
+
+// Display-only formatter, built once; toLocaleDateString would construct a new one per call.
+// Wire-format strings (input values, query params) are assembled by hand, not from locale data.
+const _dayFmt = new Intl.DateTimeFormat(undefined, {weekday: 'long', month: 'short', day: 'numeric'});
+
+function toLocalDate(d) { return `${d.getFullYear()}-${pad(d.getMonth()+1)}-${pad(d.getDate())}`; } // YYYY-MM-DD
+function toLocalTime(d) { return `${pad(d.getHours())}:${pad(d.getMinutes())}`; }                   // HH:MM
+function label(d) { return _dayFmt.format(d); }                                                     // e.g. Friday, Jan 3
@@ -0,0 +1,223 @@
+// Rows are looked up by id from the delegated list listeners below
+const projectsById = new Map();
+
+async function loadProjects() {
+  const data = await jsonFetch('/api/projects', {memo: true});
+  const listMP = document.getElementById('projectListMP');
+  const listLP = document.getElementById('projectListLP');
+  listMP.innerHTML = '';
+  listLP.innerHTML = '';
+  projectsById.clear();
+
+  for (const p of data) {
+    if (!p.is_active) continue;
+    projectsById.set(p.id, p);
+    const li = document.createElement('li');
+    li.className = 'flex justify-between items-center border rounded px-3 py-2';
+    li.dataset.id = p.id;
+    // Prefix span
+    const prefixSpan = document.createElement('span');
+    prefixSpan.className = 'font-medium';
+    // Show a '#' prefix for Liquid Pack machine ID projects
+    let displayPrefix = p.prefix;
+    if (p.division === 'Liquid Pack') {
+      // Auto-generated Liquid Pack projects fall within [2000,2999]; everything outside is a machine ID
+      if (p.prefix < 2000 || p.prefix >= 3000) {
+        displayPrefix = `#${p.prefix}`;
+      }
+    }
+    prefixSpan.textContent = displayPrefix;
+    li.appendChild(prefixSpan);
+    // Title span; click-to-edit is handled by the delegated list listener
+    const titleSpan = document.createElement('span');
+    titleSpan.className = 'flex-1 ml-2';
+    titleSpan.setAttribute('data-title', '');
+    titleSpan.textContent = p.title;
+    titleSpan.style.cursor = 'pointer';
+    li.appendChild(titleSpan);
+    // Lowercased search text, computed once per row rather than per keystroke
+    li.dataset.search = `${displayPrefix} ${p.title}`.toLowerCase();
+    // Remove button
+    const delBtn = document.createElement('button');
+    // Display a simple minus symbol instead of the word "Remove" to save space
+    delBtn.className = 'text-red-600 text-xs';
+    delBtn.setAttribute('data-id', p.id);
+    delBtn.textContent = '−';
+    li.appendChild(delBtn);
+    if (p.division === 'Melbourne Power') {
+      listMP.appendChild(li);
+    } else {
+      listLP.appendChild(li);
+    }
+  }
+
+  // Re-apply search filters to the fresh rows, but only when a search is active
+  const mp = document.getElementById('searchMP');
+  if (mp && mp.value) filterMPList();
+  const lp = document.getElementById('searchLP');
+  if (lp && lp.value) filterLPList();
+}
+
+// Inline title editing for one list item
+function editTitle(li, titleSpan) {
+  const p = projectsById.get(Number(li.dataset.id));
+  if (!p) return;
+  const displayPrefix = li.firstElementChild.textContent;
+  const input = document.createElement('input');
+  input.type = 'text';
+  input.value = p.title;
+  input.className = 'flex-1 ml-2 border rounded px-2 py-1 text-sm';
+  // Replace the span with input
+  li.replaceChild(input, titleSpan);
+  input.focus();
+  input.select();
+  let finished = false;
+  const finishEdit = async (save) => {
+    // Enter/Escape and the resulting blur can both land here; act once
+    if (finished) return;
+    finished = true;
+    const newTitle = input.value.trim();
+    if (save && newTitle && newTitle !== p.title) {
+      try {
+        const updated = await jsonFetch(`/api/projects/${p.id}`, {method: 'PUT', body: JSON.stringify({title: newTitle})});
+        // Patch this row in place instead of refetching and rebuilding both lists
+        p.title = updated.title;
+        titleSpan.textContent = p.title;
+        li.dataset.search = `${displayPrefix} ${p.title}`.toLowerCase();
+      } catch (err) { alert(err.message); }
+    }
+    li.replaceChild(titleSpan, input);
+    (p.division === 'Melbourne Power' ? filterMPList : filterLPList)();
+  };
+  input.addEventListener('blur', () => finishEdit(true));
+  input.addEventListener('keydown', async (ev) => {
+    if (ev.key === 'Enter') { ev.preventDefault(); await finishEdit(true); }
+    if (ev.key === 'Escape') { ev.preventDefault(); await finishEdit(false); }
+  });
+}
+
+// One click listener per list (not per row) for remove buttons and title edits
+for (const listId of ['projectListMP', 'projectListLP']) {
+  document.getElementById(listId).addEventListener('click', async (e) => {
+    const delBtn = e.target.closest('button[data-id]');
+    if (delBtn) {
+      const id = delBtn.getAttribute('data-id');
+      if (!(await askConfirm('Mark this project inactive? Existing entries remain intact.'))) return;
+      await fetch(`/api/projects/${id}`, {method: 'DELETE'});
+      invalidate('/api/projects');
+      await loadProjects();
+      return;
+    }
+    const titleSpan = e.target.closest('span[data-title]');
+    if (titleSpan) editTitle(titleSpan.closest('li'), titleSpan);
+  });
+}
+
+document.getElementById('newProjectFormMP').addEventListener('submit', async (e) => {
+  e.preventDefault();
+  const title = document.getElementById('projectTitleMP').value.trim();
+  if (!title) return;
+  try {
+    await jsonFetch('/api/projects', {method: 'POST', body: JSON.stringify({title, division:'Melbourne Power'})});
+    document.getElementById('projectTitleMP').value = '';
+    await loadProjects();
+  } catch (err) { alert(err.message); }
+});
+
+// Search/filter functions for projects lists
+function filterList(listId, query) {
+  const list = document.getElementById(listId);
+  if (!list) return;
+  const term = (query || '').toString().toLowerCase();
+  // Tailwind's .hidden is generated after .flex, so it wins on the flex row items
+  list.querySelectorAll('li').forEach(li => {
+    li.classList.toggle('hidden', !li.dataset.search.includes(term));
+  });
+}
+function filterMPList() {
+  const input = document.getElementById('searchMP');
+  if (input) filterList('projectListMP', input.value);
+}
+function filterLPList() {
+  const input = document.getElementById('searchLP');
+  if (input) filterList('projectListLP', input.value);
+}
+// Attach input event listeners to search fields if they exist
+const searchMPInput = document.getElementById('searchMP');
+if (searchMPInput) searchMPInput.addEventListener('input', debounce(filterMPList, 150));
+const searchLPInput = document.getElementById('searchLP');
+if (searchLPInput) searchLPInput.addEventListener('input', debounce(filterLPList, 150));
+
+// Toggle display of Machine ID fields based on the checkbox
+const machineToggle = document.getElementById('machineIdToggle');
+
+if (machineToggle) {
+  const normalDiv = document.getElementById('lpNormalFields');
+  const machineDiv = document.getElementById('lpMachineFields');
+  const titleInput = document.getElementById('projectTitleLP');
+  const prefixInput = document.getElementById('machinePrefixLP');
+  const machineTitleInput = document.getElementById('machineTitleLP');
+  const updateVisibility = () => {
+    if (machineToggle.checked) {
+      // Show machine ID inputs, hide normal title input
+      normalDiv.classList.add('hidden');
+      machineDiv.classList.remove('hidden');
+      // Switch HTML5 validation to the visible inputs
+      if (titleInput) titleInput.removeAttribute('required');
+      if (prefixInput) prefixInput.setAttribute('required','');
+      if (machineTitleInput) machineTitleInput.setAttribute('required','');
+    } else {
+      normalDiv.classList.remove('hidden');
+      machineDiv.classList.add('hidden');
+      // Switch validation back to normal mode
+      if (titleInput) titleInput.setAttribute('required','');
+      if (prefixInput) prefixInput.removeAttribute('required');
+      if (machineTitleInput) machineTitleInput.removeAttribute('required');
+    }
+  };
+  machineToggle.addEventListener('change', updateVisibility);
+  // Run once on load
+  updateVisibility();
+}
+
+
+document.getElementById('newProjectFormLP').addEventListener('submit', async (e) => {
+  e.preventDefault();
+  const isMachine = document.getElementById('machineIdToggle')?.checked;
+  if (isMachine) {
+    // Create a Machine ID project with custom numeric prefix and title
+    const prefixStr = document.getElementById('machinePrefixLP').value.trim();
+    const title = document.getElementById('machineTitleLP').value.trim();
+    if (!prefixStr || !title) {
+      alert('Please enter both a prefix and a title for the machine ID project.');
+      return;
+    }
+    const prefixNum = Number(prefixStr);
+    if (Number.isNaN(prefixNum) || prefixNum <= 0) {
+      alert('Prefix must be a positive number.');
+      return;
+    }
+    if (prefixNum >= 2000 && prefixNum < 3000) {
+      alert('Machine ID prefix must not be between 2000 and 2999, as that range is reserved for auto-generated Liquid Pack projects.');
+      return;
+    }
+    try {
+      await jsonFetch('/api/projects', {method: 'POST', body: JSON.stringify({title, division:'Liquid Pack', prefix: prefixNum})});
+      // Clear fields
+      document.getElementById('machinePrefixLP').value = '';
+      document.getElementById('machineTitleLP').value = '';
+      await loadProjects();
+    } catch (err) { alert(err.message); }
+  } else {
+    // Create a normal Liquid Pack project (auto-prefix)
+    const title = document.getElementById('projectTitleLP').value.trim();
+    if (!title) return;
+    try {
+      await jsonFetch('/api/projects', {method: 'POST', body: JSON.stringify({title, division:'Liquid Pack'})});
+      document.getElementById('projectTitleLP').value = '';
+      await loadProjects();
+    } catch (err) { alert(err.message); }
+  }
+});
+
+loadProjects();
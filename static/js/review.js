@@ -0,0 +1,119 @@
+// Current week ending Thursday
+function currentThursday(){
+  const now = new Date();
+  const day = now.getDay(); // 0 Sun .. 6 Sat
+  const diffToThu = (4 - day + 7) % 7; // 4 = Thu
+  const thu = new Date(now); thu.setDate(now.getDate() + diffToThu);
+  thu.setHours(0,0,0,0);
+  return thu;
+}
+
+function rangeFriToThu(thu){
+  const days=[]; const d=new Date(thu);
+  for(let i=6;i>=0;i--){ const x=new Date(d); x.setDate(d.getDate()-i); days.push(x); }
+  return days; // Fri..Thu
+}
+
+async function loadUsers(){
+  const users = await jsonFetch('/api/users');
+  const sel = document.getElementById('reviewUser');
+  sel.innerHTML='';
+  for(const u of users){
+    const opt=document.createElement('option'); opt.value=u.id; opt.textContent=u.username; sel.appendChild(opt);
+  }
+}
+
+const REVIEW_PAGE = 1000;  // the server's ENTRIES_MAX_LIMIT
+
+// Bumped per renderWeek call; a response that arrives after a newer call started is dropped
+let renderSeq = 0;
+let pendingPaint = 0;
+
+async function renderWeek(){
+  const seq = ++renderSeq;
+  const userId = document.getElementById('reviewUser').value;
+  const weekEnd = new Date(document.getElementById('reviewWeekEnd').value);
+  if(!userId || isNaN(weekEnd)) return;
+  const days = rangeFriToThu(weekEnd);
+  const dayIndex = new Map(days.map((d, i) => [toLocalDate(d), i]));
+  const start = new Date(days[0]); start.setHours(0,0,0,0);
+  const end = new Date(days[6]); end.setHours(23,59,59,999);
+
+  // Fetch entries for user & range
+  // /api/entries is paged (max 1000 per call); follow the keyset cursor so the totals see every entry
+  const base = `/api/entries?user_id=${userId}&start=${toLocalDate(start)}&end=${toLocalDate(end)}&limit=${REVIEW_PAGE}`;
+  const data = [];
+  let url = base;
+  while (true) {
+    const page = await jsonFetch(url);
+    data.push(...page);
+    if (page.length < REVIEW_PAGE || seq !== renderSeq) break;
+    const last = page[page.length - 1];
+    url = `${base}&before=${encodeURIComponent(last.start_time)}&before_id=${last.id}`;
+  }
+  if(seq !== renderSeq) return;
+
+  // Header Fri..Thu
+  const headCells = days.map(d => {
+    const th=document.createElement('th'); th.className='py-2'; th.textContent = label(d); return th;
+  });
+
+  // Sum hours per (day, project) in one flat map; prefix is unique, so prefix*7+day is too
+  const sums = new Map();
+  const totals = new Array(7).fill(0);
+  for(const e of data){
+    const idx = dayIndex.get(toLocalDate(new Date(e.start_time)));
+    if(idx===undefined) continue;
+    const key = e.project_prefix * 7 + idx;
+    let item = sums.get(key);
+    if(!item){ item = {title: e.project_title, prefix: e.project_prefix, hours: 0, idx}; sums.set(key, item); }
+    item.hours += e.duration_hours;
+    totals[idx] += e.duration_hours;
+  }
+  // Bucket into columns, keeping first-seen order within each day
+  const byDay = Array.from({length:7}, () => []);
+  for(const item of sums.values()) byDay[item.idx].push(item);
+
+  // Header and both body rows are built off-DOM and swapped in together on the next frame.
+  // Row 1: one row; each column = vertical stack of fixed-size square cards
+  const cardTpl = document.getElementById('dayCardTpl').content.firstElementChild;
+  const tr = document.createElement('tr'); tr.className='align-top';
+  for(let c=0;c<7;c++){
+    const td=document.createElement('td'); td.className='py-3 align-top';
+    const col=document.createElement('div');
+    col.className='flex flex-col gap-3 items-start';
+    for(const item of byDay[c]){
+      const card = cardTpl.cloneNode(true);
+      card.querySelector('.prefix').textContent = item.prefix;
+      card.querySelector('.title').textContent = item.title;
+      card.querySelector('.hours').textContent = `${item.hours.toFixed(2)} h`;
+      col.appendChild(card);
+    }
+    td.appendChild(col);
+    tr.appendChild(td);
+  }
+
+  // Row 2: totals
+  const trTot = document.createElement('tr'); trTot.className='border-t';
+  for(let c=0;c<7;c++){
+    const td=document.createElement('td'); td.className='py-2 font-semibold text-center';
+    td.textContent = `Total: ${totals[c].toFixed(2)} h`;
+    trTot.appendChild(td);
+  }
+  cancelAnimationFrame(pendingPaint);
+  pendingPaint = requestAnimationFrame(() => {
+    document.getElementById('reviewHead').replaceChildren(...headCells);
+    document.getElementById('reviewBody').replaceChildren(tr, trTot);
+  });
+}
+
+// Init
+(async function(){
+  // The user list is the only thing renderWeek waits on; set up everything else while it loads
+  const usersP = loadUsers();
+  document.getElementById('reviewWeekEnd').value = toLocalDate(currentThursday());
+  document.getElementById('reviewApply').addEventListener('click', renderWeek);
+  document.getElementById('reviewUser').addEventListener('change', renderWeek);
+  await usersP;
+  renderWeek();
+})();